@@ -1,57 +1,135 @@
+import io
+import logging
 import requests
-from bs4 import BeautifulSoup
-import pandas as pd
+from requests.adapters import HTTPAdapter
+import urllib3
+from urllib3.response import HTTPResponse
+from urllib3.util.retry import Retry
+from lxml import html as lxml_html
+from lxml.etree import XPath
+from openpyxl import Workbook
 import tkinter as tk
 from tkinter import messagebox, ttk
 from threading import Thread
 
+# Brotli responses can only be decoded when the brotli package is installed
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except Exception:
+    BROTLI_AVAILABLE = False
+
+# ---------------- HTTP Session ---------------- #
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                  "AppleWebKit/537.36 (KHTML, like Gecko) "
+                  "Chrome/124.0.0.0 Safari/537.36",
+    "Accept-Language": "en-US,en;q=0.5",
+    "Accept-Encoding": "gzip, deflate, br" if BROTLI_AVAILABLE else "gzip, deflate"
+}
+
+# One pooled session for every page fetch so keep-alive connections are reused
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=20, pool_maxsize=50,
+                       max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                                         allowed_methods={"GET"}))
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+SESSION.headers.update(HEADERS)
+
+# Compiled once; lxml evaluates these in C with no per-node Python objects
+def _has_class(name):
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+_XP_RESULTS = XPath('.//div[@data-component-type="s-search-result"]')
+_XP_TITLE = XPath('(.//h2)[1]//text()')
+_XP_PRICE = XPath(f'.//span[{_has_class("a-price-whole")}]/text()')
+_XP_RATING = XPath(f'.//span[{_has_class("a-icon-alt")}]/text()')
+_XP_PRIME = XPath(f'boolean(.//*[{_has_class("a-icon-prime")}])')
+# The last results page renders "Next" as a disabled <span> instead of a link
+_XP_HAS_NEXT = XPath(f'boolean(.//a[{_has_class("s-pagination-next")}])')
+
 # ---------------- Web Scraping Function ---------------- #
-def scrape_amazon(url, status_label):
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                      "AppleWebKit/537.36 (KHTML, like Gecko) "
-                      "Chrome/124.0.0.0 Safari/537.36",
-        "Accept-Language": "en-US,en;q=0.5"
-    }
-
-    products = []
+def _get_measured(url):
+    """GET url; returns (decoded body, Content-Encoding, bytes received on the wire)."""
+    res = SESSION.get(url, timeout=10, stream=True)
+    # Neither Content-Length nor raw.tell() covers chunked bodies, so read the
+    # still-encoded bytes and decode them here
+    encoding = res.headers.get("Content-Encoding", "")
+    try:
+        wire = b"".join(res.raw.stream(65536, decode_content=False))
+        body = HTTPResponse(body=io.BytesIO(wire), headers={"Content-Encoding": encoding},
+                            preload_content=False).read(decode_content=True)
+    except urllib3.exceptions.HTTPError as e:
+        # raw reads raise urllib3 errors; surface them like requests does
+        raise requests.ConnectionError(e)
+    return body, encoding or "none", len(wire)
+
+def scrape_amazon(url, status_label, max_pages=None):
+    # Rows go straight into a write-only workbook instead of a list + DataFrame.
+    # It is only created once there is a first row, and always saved once created:
+    # an unsaved write-only workbook spews lxml errors when it is garbage-collected.
+    wb = ws = None
+    count = 0
     page = 1
+    error = None
     status_label.config(text="Scraping in progress... Please wait ⏳")
     
-    while True:
-        paged_url = f"{url}&page={page}"
-        res = requests.get(paged_url, headers=headers)
-        soup = BeautifulSoup(res.text, "html.parser")
-        
-        # Find product containers
-        results = soup.find_all("div", {"data-component-type": "s-search-result"})
-        if not results:
-            break
-        
-        for item in results:
-            title = item.h2.text.strip() if item.h2 else "N/A"
-            price = item.find("span", "a-price-whole")
-            price = price.text.strip() if price else "N/A"
-            rating = item.find("span", class_="a-icon-alt")
-            rating = rating.text.strip() if rating else "N/A"
-            availability = "In stock" if "Prime" in item.text else "Check on site"
+    try:
+        while True:
+            paged_url = f"{url}&page={page}"
+            try:
+                if page == 1:
+                    # Log once whether the server really compresses its pages
+                    content, encoding, wire_size = _get_measured(paged_url)
+                    logging.info("Content-Encoding: %s, %d bytes on the wire -> %d bytes of HTML",
+                                 encoding, wire_size, len(content))
+                else:
+                    content = SESSION.get(paged_url, timeout=10).content
+            except requests.RequestException as e:
+                # e.g. retries used up on Amazon's 503 bot page; keep what earlier pages gave us
+                error = e
+                break
+            if not content.strip():
+                # lxml refuses empty documents; treat it like a page without results
+                break
+            tree = lxml_html.fromstring(content)
+            
+            # Find product containers
+            results = _XP_RESULTS(tree)
+            if not results:
+                break
+            if ws is None:
+                wb = Workbook(write_only=True)
+                ws = wb.create_sheet()
+                ws.append(["Title", "Price", "Rating", "Availability"])
             
-            products.append({
-                "Title": title,
-                "Price": price,
-                "Rating": rating,
-                "Availability": availability
-            })
-        
-        page += 1
-        if page > 3:  # Limit to 3 pages for demo
-            break
-
-    # Save to Excel
-    if products:
-        df = pd.DataFrame(products)
-        df.to_excel("amazon_products.xlsx", index=False)
-        status_label.config(text=f"✅ Scraping complete! {len(products)} products saved to amazon_products.xlsx")
+            for item in results:
+                title = "".join(_XP_TITLE(item)).strip() or "N/A"
+                price = (_XP_PRICE(item) or ["N/A"])[0].strip()
+                rating = (_XP_RATING(item) or ["N/A"])[0].strip()
+                availability = "In stock" if _XP_PRIME(item) else "Check on site"
+                
+                ws.append([title, price, rating, availability])
+                count += 1
+            
+            if not _XP_HAS_NEXT(tree):
+                break
+            page += 1
+            if max_pages and page > max_pages:
+                break
+    finally:
+        # Save to Excel
+        if wb:
+            wb.save("amazon_products.xlsx")
+
+    if count:
+        if error:
+            status_label.config(text=f"⚠️ Stopped at page {page} ({error}). {count} products saved to amazon_products.xlsx")
+        else:
+            status_label.config(text=f"✅ Scraping complete! {count} products saved to amazon_products.xlsx")
+    elif error:
+        status_label.config(text=f"❌ Request failed: {error}")
     else:
         status_label.config(text="❌ No data found. Please check the URL.")
 
@@ -66,6 +144,7 @@ def start_scraping():
     Thread(target=scrape_amazon, args=(url, status_label)).start()
 
 # GUI setup
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
 root = tk.Tk()
 root.title("Amazon Web Scraper")
 root.geometry("600x400")
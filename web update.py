@@ -8,12 +8,23 @@ Enhanced version:
  - Save to CSV / Excel / SQLite / MySQL
 """
 
+import asyncio
+import csv
+import logging
+import re
+import shutil
+import tempfile
 import threading
+import httpx
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
+import soupsieve as sv
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import pandas as pd
+import xlsxwriter
 import sqlite3
 import os
 
@@ -23,29 +34,101 @@ try:
 except:
     MYSQL_AVAILABLE = False
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    PYARROW_AVAILABLE = True
+except:
+    PYARROW_AVAILABLE = False
+
+try:
+    import requests_cache
+    REQUESTS_CACHE_AVAILABLE = True
+except:
+    REQUESTS_CACHE_AVAILABLE = False
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except:
+    BROTLI_AVAILABLE = False
+
+HEADERS = {"Accept-Encoding": "gzip, deflate, br" if BROTLI_AVAILABLE else "gzip, deflate"}
+
+
+# Pooled session for single-book lookups (category crawls go through the async client).
+# With requests-cache installed, its responses are kept in scrape_cache.sqlite so re-runs
+# skip the network.
+if REQUESTS_CACHE_AVAILABLE:
+    SESSION = requests_cache.CachedSession("scrape_cache", backend="sqlite",
+                                           expire_after=3600, cache_control=True)
+else:
+    SESSION = requests.Session()
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+_adapter = HTTPAdapter(pool_connections=20, pool_maxsize=50,
+                       max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=RETRY_STATUSES,
+                                         allowed_methods={"GET"}))
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+SESSION.headers.update(HEADERS)
+
+
+# Parse only products, the pager's "next" item and availability. Regexes, because the
+# strainer matches the full class string ("instock availability").
+PRODUCTS_STRAINER = SoupStrainer(["article", "li"], class_=re.compile(r"\b(?:product_pod|next)\b"))
+AVAILABILITY_STRAINER = SoupStrainer("p", class_=re.compile(r"\bavailability\b"))
+
+# Selectors compiled once instead of re-parsing the CSS string on every lookup
+SEL_PRODUCTS = sv.compile("article.product_pod")
+SEL_PRICE = sv.compile("p.price_color")
+SEL_RATING = sv.compile("p.star-rating")
+SEL_AVAIL = sv.compile("p.availability")
+SEL_NEXT = sv.compile("li.next a")
+
+WHITESPACE = re.compile(r"\s+")
+
+
+def make_async_client():
+    """HTTP/2 client for category crawls; many requests share one multiplexed connection."""
+    # The transport retries failed connects; _get() below retries 429/5xx answers
+    transport = httpx.AsyncHTTPTransport(http2=True, retries=3,
+                                         limits=httpx.Limits(max_connections=100, max_keepalive_connections=20))
+    return httpx.AsyncClient(transport=transport, timeout=10, follow_redirects=True, headers=HEADERS)
+
+
+async def _get(client, url, retries=3, backoff_factor=0.5):
+    """GET that backs off and retries on RETRY_STATUSES, like the session's urllib3 Retry."""
+    for attempt in range(retries + 1):
+        resp = await client.get(url)
+        if resp.status_code not in RETRY_STATUSES or attempt == retries:
+            return resp
+        await asyncio.sleep(backoff_factor * 2 ** attempt)
+
+
+RATINGS = {"One": 1, "Two": 2, "Three": 3, "Four": 4, "Five": 5}
+
 
 def parse_rating(rating_class):
-    mapping = {"One": 1, "Two": 2, "Three": 3, "Four": 4, "Five": 5}
-    return mapping.get(rating_class, None)
+    return RATINGS.get(rating_class, None)
 
 
-def scrape_single_book(url):
+def scrape_single_book(url, session=SESSION):
     """Scrape details of a single book page."""
     data = []
-    resp = requests.get(url, timeout=10)
+    resp = session.get(url, timeout=10)
     resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, "html.parser")
+    soup = BeautifulSoup(resp.content, "lxml")
 
     title = soup.select_one(".product_main h1").text.strip()
     price = soup.select_one(".price_color").text.strip()
-    rating_el = soup.select_one("p.star-rating")
+    rating_el = SEL_RATING.select_one(soup)
     rating = None
     if rating_el:
         classes = rating_el.get("class", [])
         if len(classes) > 1:
             rating = parse_rating(classes[1])
-    availability = soup.select_one("p.availability")
-    availability = " ".join(availability.text.split()) if availability else ""
+    availability = SEL_AVAIL.select_one(soup)
+    availability = WHITESPACE.sub(" ", availability.text).strip() if availability else ""
     data.append({
         "Title": title,
         "Price": price,
@@ -57,9 +140,34 @@ def scrape_single_book(url):
     return data
 
 
-def scrape_category(url, max_pages=None, progress_callback=None):
-    """Scrape multiple pages of a category."""
+async def _fetch_availability(client, product_link):
+    """Fetch a product page and return its availability text ("" on failure)."""
+    try:
+        p_resp = await _get(client, product_link)
+        p_resp.raise_for_status()
+        p_soup = BeautifulSoup(p_resp.content, "lxml", parse_only=AVAILABILITY_STRAINER)
+        avail_el = SEL_AVAIL.select_one(p_soup)
+        return WHITESPACE.sub(" ", avail_el.text).strip() if avail_el else ""
+    except httpx.HTTPError as e:
+        logging.warning("Dropped availability for %s: %s", product_link, e)
+        return ""
+
+
+async def scrape_category(url, max_pages=None, progress_callback=None, client=None, row_callback=None,
+                          deep_check=False):
+    """Scrape multiple pages of a category.
+
+    With row_callback, each row is handed over as soon as its page is done
+    instead of being collected in the returned list. Availability is read
+    from the listing page unless deep_check asks for each product page.
+    """
+    if client is None:
+        async with make_async_client() as client:
+            return await scrape_category(url, max_pages, progress_callback, client, row_callback, deep_check)
+
     results = []
+    # Product link -> pending/finished availability fetch, so a book listed twice is fetched once
+    availability_tasks = {}
     page_num = 1
     while True:
         if page_num == 1:
@@ -71,20 +179,21 @@ def scrape_category(url, max_pages=None, progress_callback=None):
             else:
                 page_url = f"{url.rstrip('/')}/page-{page_num}.html"
 
-        resp = requests.get(page_url, timeout=10)
+        resp = await _get(client, page_url)
         if resp.status_code == 404:
             break
         resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, "html.parser")
+        soup = BeautifulSoup(resp.content, "lxml", parse_only=PRODUCTS_STRAINER)
 
-        products = soup.select("article.product_pod")
+        products = SEL_PRODUCTS.select(soup)
         if not products:
             break
 
+        rows = []
         for prod in products:
             title = prod.h3.a.get("title", "").strip()
-            price = prod.select_one("p.price_color").text.strip()
-            rating_classes = prod.select_one("p.star-rating")
+            price = SEL_PRICE.select_one(prod).text.strip()
+            rating_classes = SEL_RATING.select_one(prod)
             rating = None
             if rating_classes:
                 classes = rating_classes.get("class", [])
@@ -94,17 +203,11 @@ def scrape_category(url, max_pages=None, progress_callback=None):
             relative_link = prod.h3.a.get("href", "")
             product_link = requests.compat.urljoin(page_url, relative_link)
 
-            # Get availability
-            try:
-                p_resp = requests.get(product_link, timeout=8)
-                p_resp.raise_for_status()
-                p_soup = BeautifulSoup(p_resp.text, "html.parser")
-                avail_el = p_soup.select_one("p.availability")
-                availability = " ".join(avail_el.text.split()) if avail_el else ""
-            except:
-                availability = ""
-
-            results.append({
+            # The listing already shows the stock status, no extra request needed
+            avail_el = SEL_AVAIL.select_one(prod)
+            availability = WHITESPACE.sub(" ", avail_el.text).strip() if avail_el else ""
+
+            rows.append({
                 "Title": title,
                 "Price": price,
                 "Rating": rating,
@@ -113,8 +216,26 @@ def scrape_category(url, max_pages=None, progress_callback=None):
                 "Link": product_link
             })
 
+        if deep_check:
+            # Product pages carry the exact stock count; fetch the whole page's worth at once
+            for row in rows:
+                if row["Link"] not in availability_tasks:
+                    availability_tasks[row["Link"]] = asyncio.ensure_future(_fetch_availability(client, row["Link"]))
+            availabilities = await asyncio.gather(*[availability_tasks[row["Link"]] for row in rows])
+            for row, availability in zip(rows, availabilities):
+                row["Availability"] = availability
+
+        for row in rows:
+            if row_callback:
+                row_callback(row)
+            else:
+                results.append(row)
+
         if progress_callback:
             progress_callback(page_num)
+        # No "next" link means this was the last page; don't spend a request on the 404
+        if not SEL_NEXT.select_one(soup):
+            break
         page_num += 1
         if max_pages and page_num > max_pages:
             break
@@ -122,24 +243,105 @@ def scrape_category(url, max_pages=None, progress_callback=None):
 
 
 # --------------- Storage helpers ---------------
+SPOOL_FIELDS = ("Title", "Price", "Rating", "Availability", "Page", "Link")
+
+
+def read_spool(filepath):
+    """Load a spooled scrape (CSV written row by row) back into a DataFrame."""
+    return pd.read_csv(filepath, dtype={"Rating": "Int64", "Page": "Int64"},
+                       keep_default_na=False, na_values={"Rating": [""]})
+
+
+class SpoolWriter:
+    """CSV spool for scraped rows. pyarrow's writer takes them in batches when installed."""
+
+    def __init__(self, filepath, batch_rows=500):
+        self.batch_rows = batch_rows
+        self.rows = []
+        if PYARROW_AVAILABLE:
+            self.schema = pa.schema([(c, pa.int64() if c in ("Rating", "Page") else pa.string())
+                                     for c in SPOOL_FIELDS])
+            self.writer = pacsv.CSVWriter(filepath, self.schema)
+            self.file = None
+        else:
+            self.file = open(filepath, "w", newline="", encoding="utf-8")
+            self.writer = csv.DictWriter(self.file, fieldnames=SPOOL_FIELDS)
+            self.writer.writeheader()
+
+    def write(self, row):
+        if self.file:
+            self.writer.writerow(row)
+            return
+        self.rows.append(row)
+        if len(self.rows) >= self.batch_rows:
+            self.flush()
+
+    def flush(self):
+        if self.rows:
+            self.writer.write_batch(pa.RecordBatch.from_pylist(self.rows, schema=self.schema))
+            self.rows = []
+
+    def close(self):
+        if self.file:
+            self.file.close()
+        else:
+            self.flush()
+            self.writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
 def save_to_csv(df, filepath):
     df.to_csv(filepath, index=False, encoding="utf-8")
 
 
 def save_to_excel(df, filepath):
-    df.to_excel(filepath, index=False, engine="openpyxl")
+    # constant_memory flushes every finished row to disk, so rows must be written in order;
+    # pandas' ExcelWriter fills column by column, hence the direct writes.
+    wb = xlsxwriter.Workbook(filepath, {"constant_memory": True})
+    ws = wb.add_worksheet()
+    ws.write_row(0, 0, list(df.columns))
+    for r, row in enumerate(df.astype(object).where(df.notna(), None).itertuples(index=False, name=None), start=1):
+        ws.write_row(r, 0, row)
+    wb.close()
+
+
+def _sqlite_type(dtype):
+    if dtype.kind in "iub":
+        return "INTEGER"
+    if dtype.kind == "f":
+        return "REAL"
+    return "TEXT"
 
 
 def save_to_sqlite(df, filepath, table_name="products"):
     conn = sqlite3.connect(filepath)
-    df.to_sql(table_name, conn, if_exists="replace", index=False)
+    # The file is rebuilt from scratch on every save, so crash safety is not needed
+    conn.execute("PRAGMA journal_mode=MEMORY")
+    conn.execute("PRAGMA synchronous=OFF")
+    cols = df.columns
+    col_defs = ", ".join([f"`{c}` {_sqlite_type(df[c].dtype)}" for c in cols])
+    insert_sql = f"INSERT INTO `{table_name}` ({', '.join([f'`{c}`' for c in cols])}) VALUES ({', '.join(['?']*len(cols))})"
+    rows = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+    with conn:  # one transaction for the whole insert
+        conn.execute(f"DROP TABLE IF EXISTS `{table_name}`")
+        conn.execute(f"CREATE TABLE `{table_name}` ({col_defs})")
+        conn.executemany(insert_sql, rows)
     conn.close()
 
 
+MYSQL_BATCH_ROWS = 1000
+
+
 def save_to_mysql(df, host, port, user, password, database, table_name="products"):
     if not MYSQL_AVAILABLE:
         raise RuntimeError("mysql-connector-python not installed.")
-    conn = mysql.connector.connect(host=host, port=port, user=user, password=password)
+    # use_pure=False picks the C extension when it is installed
+    conn = mysql.connector.connect(host=host, port=port, user=user, password=password, use_pure=False)
     cursor = conn.cursor()
     cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{database}`")
     conn.database = database
@@ -147,14 +349,27 @@ def save_to_mysql(df, host, port, user, password, database, table_name="products
     cols = df.columns
     col_defs = ", ".join([f"`{c}` TEXT" for c in cols])
     cursor.execute(f"CREATE TABLE `{table_name}` ({col_defs})")
-    insert_sql = f"INSERT INTO `{table_name}` ({', '.join(cols)}) VALUES ({', '.join(['%s']*len(cols))})"
-    cursor.executemany(insert_sql, [tuple(str(x) for x in r) for r in df.values.tolist()])
+    rows = list(df.astype(str).itertuples(index=False, name=None))
+    # One multi-row INSERT per batch: a round-trip per thousand rows instead of per row
+    insert_sql = f"INSERT INTO `{table_name}` ({', '.join(cols)}) VALUES "
+    row_sql = f"({', '.join(['%s']*len(cols))})"
+    for i in range(0, len(rows), MYSQL_BATCH_ROWS):
+        batch = rows[i:i + MYSQL_BATCH_ROWS]
+        cursor.execute(insert_sql + ", ".join([row_sql] * len(batch)), [v for r in batch for v in r])
     conn.commit()
     cursor.close()
     conn.close()
 
 
 # --------------- GUI ---------------
+def is_single_book_url(url):
+    # Book pages live at catalogue/<slug>/index.html; anything else is crawled as a category
+    return "catalogue/" in url and url.endswith(".html")
+
+
+PREVIEW_LIMIT = 500  # rows shown in the Treeview; the full scrape lives in the spool file
+
+
 class ScraperGUI:
     def __init__(self, root):
         self.root = root
@@ -162,7 +377,18 @@ class ScraperGUI:
         root.geometry("720x520")
         root.resizable(False, False)
 
-        self.results = []
+        # Rows are streamed to a temporary CSV while scraping; only a preview stays in memory
+        self.spool_path = None
+        self.row_count = 0
+        # The spool belongs to this thread until it finishes
+        self.scrape_thread = None
+        # Kept on the instance so pooled connections survive across "Start" clicks
+        self.session = SESSION
+        # Category crawls run on one long-lived event loop so the async client's
+        # keep-alive connections are not torn down with each asyncio.run()
+        self.loop = asyncio.new_event_loop()
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+        self.client = make_async_client()
 
         frame_top = ttk.LabelFrame(root, text="Scraping Settings")
         frame_top.place(x=10, y=10, width=700, height=180)
@@ -182,6 +408,17 @@ class ScraperGUI:
         ttk.Radiobutton(frame_top, text="SQLite", variable=self.save_type, value="sqlite").place(x=200, y=100)
         ttk.Radiobutton(frame_top, text="MySQL", variable=self.save_type, value="mysql").place(x=270, y=100)
 
+        self.deep_check_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(frame_top, text="Check availability on each product page (slower)",
+                        variable=self.deep_check_var).place(x=10, y=130)
+        self.force_refresh_var = tk.BooleanVar(value=False)
+        # Only single-book lookups are cached, so the option is disabled for category URLs
+        self.force_refresh_check = ttk.Checkbutton(frame_top, text="Force refresh (single book, ignore cache)",
+                                                   variable=self.force_refresh_var)
+        self.force_refresh_check.place(x=360, y=130)
+        self.url_var.trace_add("write", self.on_url_change)
+        self.on_url_change()
+
         ttk.Button(root, text="Start", command=self.start_scrape).place(x=10, y=200, width=120, height=35)
         ttk.Button(root, text="Save", command=self.save_results).place(x=140, y=200, width=100, height=35)
         ttk.Button(root, text="Clear", command=self.clear_results).place(x=250, y=200, width=100, height=35)
@@ -198,66 +435,126 @@ class ScraperGUI:
             self.tree.column(c, width=130 if c == "Title" else 90)
         self.tree.place(x=10, y=310)
 
+    def on_url_change(self, *args):
+        cached = REQUESTS_CACHE_AVAILABLE and is_single_book_url(self.url_var.get().strip())
+        self.force_refresh_check.state(["!disabled"] if cached else ["disabled"])
+
+    def _scrape_running(self, action):
+        if self.scrape_thread and self.scrape_thread.is_alive():
+            messagebox.showinfo("Scraping in progress", f"Wait for the current scrape to finish before {action}.")
+            return True
+        return False
+
     def start_scrape(self):
+        if self._scrape_running("starting another"):
+            return
         url = self.url_var.get().strip()
         if not url:
             messagebox.showerror("Error", "Please enter a URL")
             return
-        self.results = []
+        self._reset_spool()
         self.tree.delete(*self.tree.get_children())
         self.status_text.set("Scraping started...")
         self.progress["value"] = 0
 
-        threading.Thread(target=self._scrape_thread, args=(url,), daemon=True).start()
+        self.scrape_thread = threading.Thread(target=self._scrape_thread, args=(url,), daemon=True)
+        self.scrape_thread.start()
+
+    def _reset_spool(self):
+        if self.spool_path and os.path.exists(self.spool_path):
+            os.remove(self.spool_path)
+        fd, self.spool_path = tempfile.mkstemp(prefix="scrape_", suffix=".csv")
+        os.close(fd)
+        self.row_count = 0
 
     def _scrape_thread(self, url):
         try:
-            if "catalogue/" in url and url.endswith(".html"):
-                # Single book
-                data = scrape_single_book(url)
-            else:
-                maxp = int(self.max_pages_var.get()) if self.max_pages_var.get().isdigit() else None
-                data = scrape_category(url, maxp, progress_callback=lambda p: self.root.after(0, lambda: self.progress.step(10)))
-
-            self.results = data
-            self.root.after(0, self._show_results)
-            self.root.after(0, lambda: self.status_text.set(f"Done. {len(data)} items found."))
+            single_book = is_single_book_url(url)
+            if single_book and self.force_refresh_var.get() and REQUESTS_CACHE_AVAILABLE:
+                self.session.cache.clear()
+            with SpoolWriter(self.spool_path) as writer:
+                pending = []  # preview rows not yet handed to the Treeview
+
+                def on_row(row):
+                    writer.write(row)
+                    self.row_count += 1
+                    if self.row_count <= PREVIEW_LIMIT:
+                        pending.append((row["Title"], row["Price"], row["Rating"], row["Availability"], row["Page"]))
+
+                def flush_preview():
+                    if pending:
+                        batch = pending[:]
+                        pending.clear()
+                        self.root.after(0, lambda: self._show_rows(batch))
+
+                def on_page(page_num):
+                    flush_preview()
+                    self.root.after(0, lambda: self.progress.step(10))
+
+                if single_book:
+                    for row in scrape_single_book(url, session=self.session):
+                        on_row(row)
+                else:
+                    maxp = int(self.max_pages_var.get()) if self.max_pages_var.get().isdigit() else None
+                    crawl = scrape_category(url, maxp, progress_callback=on_page,
+                                            client=self.client, row_callback=on_row,
+                                            deep_check=self.deep_check_var.get())
+                    asyncio.run_coroutine_threadsafe(crawl, self.loop).result()
+                flush_preview()
+
+            count = self.row_count
+            self.root.after(0, lambda: self.status_text.set(f"Done. {count} items found."))
             self.root.after(0, lambda: self.progress.config(value=100))
         except Exception as e:
             self.root.after(0, lambda: messagebox.showerror("Error", f"Scraping failed: {e}"))
             self.root.after(0, lambda: self.status_text.set("Error occurred."))
 
-    def _show_results(self):
-        for item in self.results:
-            self.tree.insert("", "end", values=(item["Title"], item["Price"], item["Rating"], item["Availability"], item["Page"]))
+    def _show_rows(self, rows):
+        # One Tk callback per page of rows; Tk redraws once when it next goes idle
+        for values in rows:
+            self.tree.insert("", "end", values=values)
 
     def save_results(self):
-        if not self.results:
+        # The spool is still being written (and partly buffered) until the scrape ends
+        if self._scrape_running("saving"):
+            return
+        if not self.row_count:
             messagebox.showinfo("No data", "Run the scraper first.")
             return
-        df = pd.DataFrame(self.results)
         stype = self.save_type.get()
+        if stype == "mysql":
+            messagebox.showinfo("MySQL", "Add credentials logic if needed.")
+            return
+        fp = filedialog.asksaveasfilename(defaultextension={"csv": ".csv", "excel": ".xlsx", "sqlite": ".db"}[stype])
+        if not fp:
+            return
+        # Loading the spool and writing the file can take a while; keep the UI responsive
+        self.status_text.set("Saving...")
+        threading.Thread(target=self._save_thread, args=(stype, fp), daemon=True).start()
+
+    def _save_thread(self, stype, fp):
         try:
             if stype == "csv":
-                fp = filedialog.asksaveasfilename(defaultextension=".csv")
-                if fp:
-                    save_to_csv(df, fp)
+                # The spool already is the CSV export
+                shutil.copyfile(self.spool_path, fp)
             elif stype == "excel":
-                fp = filedialog.asksaveasfilename(defaultextension=".xlsx")
-                if fp:
-                    save_to_excel(df, fp)
+                save_to_excel(read_spool(self.spool_path), fp)
             elif stype == "sqlite":
-                fp = filedialog.asksaveasfilename(defaultextension=".db")
-                if fp:
-                    save_to_sqlite(df, fp)
-            elif stype == "mysql":
-                messagebox.showinfo("MySQL", "Add credentials logic if needed.")
-            messagebox.showinfo("Success", f"Saved successfully as {stype.upper()}")
+                save_to_sqlite(read_spool(self.spool_path), fp)
+            self.root.after(0, lambda: messagebox.showinfo("Success", f"Saved successfully as {stype.upper()}"))
+            self.root.after(0, lambda: self.status_text.set(f"Saved to {fp}"))
         except Exception as e:
-            messagebox.showerror("Error", str(e))
+            msg = str(e)
+            self.root.after(0, lambda: messagebox.showerror("Error", msg))
+            self.root.after(0, lambda: self.status_text.set("Save failed."))
 
     def clear_results(self):
-        self.results = []
+        if self._scrape_running("clearing"):
+            return
+        if self.spool_path and os.path.exists(self.spool_path):
+            os.remove(self.spool_path)
+        self.spool_path = None
+        self.row_count = 0
         self.tree.delete(*self.tree.get_children())
         self.status_text.set("Cleared.")
         self.progress["value"] = 0
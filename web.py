@@ -9,13 +9,26 @@ Features:
  - Progress bar and status updates
 """
 
+import asyncio
+import csv
+import logging
+import re
+import shutil
+import tempfile
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
+from urllib.parse import urljoin
+import aiohttp
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import pandas as pd
+import xlsxwriter
 import sqlite3
 import os
 
@@ -26,90 +39,201 @@ try:
 except Exception:
     MYSQL_AVAILABLE = False
 
+# Optional pyarrow import (faster CSV writing; falls back to the csv module)
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    PYARROW_AVAILABLE = True
+except Exception:
+    PYARROW_AVAILABLE = False
+
+# Optional brotli import (only needed to accept br-compressed pages)
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except Exception:
+    BROTLI_AVAILABLE = False
+
 # --------------- Scraping logic (BooksToScrape example) ---------------
+# Keep-alive session shared by the listing and product-page fetches (and the worker threads)
+_session = requests.Session()
+_RETRY_STATUSES = [429, 500, 502, 503, 504]
+_adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32,
+                       max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=_RETRY_STATUSES))
+_session.mount("http://", _adapter)
+_session.mount("https://", _adapter)
+_session.headers.update({"Accept-Encoding": "gzip, deflate, br" if BROTLI_AVAILABLE else "gzip, deflate",
+                         "User-Agent": "Mozilla/5.0 (compatible; safescraper/1.0)"})
+
+# products and the "Page 1 of N" item are all we read from a listing page
+_LIST_STRAINER = SoupStrainer(["article", "li"], class_=re.compile(r"\b(?:product_pod|current)\b"))
+_AVAIL_STRAINER = SoupStrainer("p", class_=re.compile(r"\bavailability\b"))
+
+# Shared pool for product-page fetches; the workers spend their time blocked on the network
+_EXECUTOR = ThreadPoolExecutor(max_workers=16)
+
+# BooksToScrape stores rating in class name like "star-rating Three"
+_RATING = {"One": 1, "Two": 2, "Three": 3, "Four": 4, "Five": 5}
+
 def parse_rating(rating_class):
-    # BooksToScrape stores rating in class name like "star-rating Three"
-    mapping = {"One": 1, "Two": 2, "Three": 3, "Four": 4, "Five": 5}
-    return mapping.get(rating_class, None)
+    return _RATING.get(rating_class)
+
+def _page_template(url):
+    # try common pagination form: replace 'index.html' or append 'page-X.html'
+    base = url.rsplit('/', 1)[0] if url.endswith("index.html") else url.rstrip('/')
+    return base + "/page-{}.html"
+
+def _fetch_listing(page_url, page_num):
+    """Fetch and parse one listing page; None means there is no such page (404)."""
+    try:
+        resp = _session.get(page_url, timeout=10)
+        if resp.status_code == 404:
+            # no more pages
+            return None
+        resp.raise_for_status()
+    except Exception as e:
+        # stop on network error
+        raise RuntimeError(f"Failed to fetch page {page_num} ({page_url}): {e}")
+    return BeautifulSoup(resp.content, "lxml", parse_only=_LIST_STRAINER)
+
+def _total_pages(soup):
+    # BooksToScrape pager reads "Page 1 of N"; returns None when the pager is missing
+    pager = soup.find("li", class_="current")
+    try:
+        return int(pager.get_text().split()[-1]) if pager else None
+    except ValueError:
+        return None
+
+async def _fetch_pages_async(pages, stop_flag, retries=3, backoff_factor=0.3):
+    """
+    Fetches listing pages concurrently, retrying like _session does.
+    - pages: list of (page_num, page_url)
+    Returns: one entry per page, in order: the body, None (404 or skipped after Stop)
+    or the RuntimeError of a page that kept failing
+    """
+    sem = asyncio.Semaphore(16)
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=32),
+                                     timeout=aiohttp.ClientTimeout(total=10),
+                                     headers={"User-Agent": _session.headers["User-Agent"],
+                                              "Accept-Encoding": _session.headers["Accept-Encoding"]}) as session:
+        async def sem_get(page_num, page_url):
+            async with sem:
+                for attempt in range(retries + 1):
+                    if stop_flag():
+                        return None
+                    try:
+                        async with session.get(page_url) as resp:
+                            if resp.status == 404:
+                                return None
+                            if resp.status not in _RETRY_STATUSES or attempt == retries:
+                                resp.raise_for_status()
+                                return await resp.read()
+                    except aiohttp.ClientResponseError as e:
+                        # error status that is not retried, or still there on the last attempt
+                        raise RuntimeError(f"Failed to fetch page {page_num} ({page_url}): {e}")
+                    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                        if attempt == retries:
+                            raise RuntimeError(f"Failed to fetch page {page_num} ({page_url}): {e}")
+                    await asyncio.sleep(backoff_factor * 2 ** attempt)
+
+        tasks = [asyncio.ensure_future(sem_get(n, u)) for n, u in pages]
+        pending = tasks
+        while pending:
+            _, pending = await asyncio.wait(pending, timeout=0.1)
+            if stop_flag():
+                # abandon requests still in flight instead of waiting out their timeout
+                for task in pending:
+                    task.cancel()
+                await asyncio.wait(tasks)
+                break
+        # one failing page must not throw away the others
+        return [None if t.cancelled() else t.exception() or t.result() for t in tasks]
 
-def scrape_books_toscrape(start_url, max_pages=None, progress_callback=None, stop_flag=lambda: False):
+def _iter_listing_pages(start_url, max_pages, stop_flag):
+    """
+    Yields (page_num, page_url, soup, total) for each listing page, in order.
+    total is the number of pages that will be scraped, or None when the pager is missing.
+    """
+    url = start_url.rstrip('/')
+    # If user provided entry to catalog page, fine. BooksToScrape page pattern: page-#.html
+    soup = _fetch_listing(url, 1)
+    if soup is None:
+        return
+    total = _total_pages(soup)
+    last = min(total, max_pages) if total and max_pages else total
+    yield 1, url, soup, last
+
+    page_template = _page_template(url)
+    if total:
+        # Page count is known: request all remaining pages at once, and none past the last one
+        pages = [(n, page_template.format(n)) for n in range(2, last + 1)]
+        if not pages or stop_flag():
+            return
+        bodies = asyncio.run(_fetch_pages_async(pages, stop_flag))
+        # hand out the pages before the first failure, then report it
+        for (page_num, page_url), body in zip(pages, bodies):
+            if isinstance(body, BaseException):
+                raise body
+            if body is None:
+                return
+            yield page_num, page_url, BeautifulSoup(body, "lxml", parse_only=_LIST_STRAINER), last
+    else:
+        # No pager: walk pages one by one until a 404 / empty page
+        page_num = 2
+        while not (max_pages and page_num > max_pages):
+            if stop_flag():
+                return
+            page_url = page_template.format(page_num)
+            soup = _fetch_listing(page_url, page_num)
+            if soup is None:
+                return
+            yield page_num, page_url, soup, None
+            page_num += 1
+
+def scrape_books_toscrape(start_url, max_pages=None, progress_callback=None, stop_flag=lambda: False,
+                          fetch_details=False):
     """
     Scrapes BooksToScrape starting from start_url.
     - max_pages: number of pages to follow (None -> follow until last)
     - progress_callback(current_page, total_pages_estimate) -> called to update UI
     - stop_flag() -> if returns True, stops early
-    Returns: list of dicts with keys: Title, Price, Rating, Availability, Page, Link
+    - fetch_details: read availability (with stock count) from each product page
+      instead of the listing page; costs one extra request per product
+    Yields: dicts with keys: Title, Price, Rating, Availability, Page, Link
+    (one page at a time, so callers can write rows out as they arrive)
     """
-    results = []
-    page_num = 1
-    url = start_url.rstrip('/')
-    # If user provided entry to catalog page, fine. BooksToScrape page pattern: page-#.html
-    while True:
+    for page_num, page_url, soup, total_pages in _iter_listing_pages(start_url, max_pages, stop_flag):
         if stop_flag():
             break
 
-        # Determine page URL
-        if page_num == 1:
-            page_url = url
-        else:
-            # try common pagination form: replace 'index.html' or append 'page-X.html'
-            if url.endswith("index.html"):
-                base = url.rsplit('/', 1)[0]
-                page_url = f"{base}/page-{page_num}.html"
-            else:
-                page_url = f"{url.rstrip('/')}/page-{page_num}.html"
-
-        try:
-            resp = requests.get(page_url, timeout=10)
-            if resp.status_code == 404:
-                # no more pages
-                break
-            resp.raise_for_status()
-        except Exception as e:
-            # stop on network error
-            raise RuntimeError(f"Failed to fetch page {page_num} ({page_url}): {e}")
-
-        soup = BeautifulSoup(resp.text, "html.parser")
-
         # Extract products
-        products = soup.select("article.product_pod")
+        products = soup.find_all("article", class_="product_pod")
         if not products:
             # nothing found — likely done
             break
 
+        page_rows = []
         for prod in products:
+            if stop_flag():
+                break
             title = prod.h3.a.get("title", "").strip()
-            price_el = prod.select_one("p.price_color")
+            price_el = prod.find("p", class_="price_color")
             price = price_el.text.strip() if price_el else ""
-            rating_classes = prod.select_one("p.star-rating")
+            rating_classes = prod.find("p", class_="star-rating")
             rating = None
             if rating_classes:
                 classes = rating_classes.get("class", [])
                 # class example: ['star-rating', 'Three']
                 if len(classes) > 1:
                     rating = parse_rating(classes[1])
-            # availability not in product_pod on listing page; attempt to follow link to product page
             relative_link = prod.h3.a.get("href", "")
-            # normalize link
-            if relative_link.startswith("../"):
-                # BooksToScrape uses ../.. links from categories
-                product_link = requests.compat.urljoin(page_url, relative_link)
-            else:
-                product_link = requests.compat.urljoin(page_url, relative_link)
-
-            # Try to fetch availability from product page (safer)
-            availability = ""
-            try:
-                p_resp = requests.get(product_link, timeout=8)
-                p_resp.raise_for_status()
-                p_soup = BeautifulSoup(p_resp.text, "html.parser")
-                avail_el = p_soup.select_one("p.availability")
-                if avail_el:
-                    availability = " ".join(avail_el.text.split())
-            except:
-                availability = ""  # keep blank if failure
-
-            results.append({
+            # normalize link (BooksToScrape uses ../.. links from categories)
+            product_link = urljoin(page_url, relative_link)
+            # the listing already shows the stock status, so no product-page request is needed
+            avail_el = prod.find("p", class_="availability")
+            availability = " ".join(avail_el.get_text().split()) if avail_el else ""
+
+            page_rows.append({
                 "Title": title,
                 "Price": price,
                 "Rating": rating,
@@ -118,30 +242,140 @@ def scrape_books_toscrape(start_url, max_pages=None, progress_callback=None, sto
                 "Link": product_link
             })
 
-        # update progress (we don't know total pages up front for BooksToScrape, so send page_num)
+        # after Stop, don't start detail requests for a partly read page
+        if fetch_details and not stop_flag():
+            # Fetch all product pages of this page concurrently for the exact stock count
+            futures = {_EXECUTOR.submit(_session.get, row["Link"], timeout=8): row for row in page_rows}
+            for future in as_completed(futures):
+                if stop_flag():
+                    # drop the requests that have not started; rows keep the listing availability
+                    for pending in futures:
+                        pending.cancel()
+                    break
+                availability = ""
+                try:
+                    p_resp = future.result()
+                    p_resp.raise_for_status()
+                    p_soup = BeautifulSoup(p_resp.content, "lxml", parse_only=_AVAIL_STRAINER)
+                    avail_el = p_soup.find("p", class_="availability")
+                    if avail_el:
+                        availability = " ".join(avail_el.text.split())
+                except requests.RequestException as e:
+                    logging.debug("Product page %s failed: %s", futures[future]["Link"], e)
+                    availability = ""  # keep blank if failure
+                futures[future]["Availability"] = availability
+
+        yield from page_rows
+
+        # update progress (total comes from the "Page 1 of N" pager; None if the page has none)
         if progress_callback:
-            progress_callback(page_num, None)
+            progress_callback(page_num, total_pages)
 
-        page_num += 1
-        if max_pages and page_num > max_pages:
-            break
+# --------------- Storage helpers ---------------
+SPOOL_FIELDS = ("Title", "Price", "Rating", "Availability", "Page", "Link")
+SPOOL_DTYPES = {"Title": str, "Price": str, "Rating": "Int64", "Availability": str, "Page": "Int64", "Link": str}
 
-    return results
+def read_spool(filepath):
+    """Read the CSV spool written during scraping into a DataFrame."""
+    # Columns and dtypes are fixed up front, so pandas builds each column array directly
+    # instead of inferring types
+    return pd.read_csv(filepath, usecols=SPOOL_FIELDS, dtype=SPOOL_DTYPES,
+                       keep_default_na=False, na_values={"Rating": [""]})
+
+class SpoolWriter:
+    """
+    Appends scraped rows (dicts with SPOOL_FIELDS keys) to a CSV file.
+    With pyarrow the rows are buffered and written batch_rows at a time by Arrow's C++
+    CSV writer; otherwise each row goes through csv.DictWriter.
+    """
+    def __init__(self, filepath, batch_rows=500):
+        self.batch_rows = batch_rows
+        self._pending = []
+        if PYARROW_AVAILABLE:
+            self._schema = pa.schema([(c, pa.int64() if c in ("Rating", "Page") else pa.string())
+                                      for c in SPOOL_FIELDS])
+            self._writer = pacsv.CSVWriter(filepath, self._schema)
+            self._file = None
+        else:
+            self._file = open(filepath, "w", newline="", encoding="utf-8")
+            self._writer = csv.DictWriter(self._file, fieldnames=SPOOL_FIELDS)
+            self._writer.writeheader()
+
+    def write(self, row):
+        if self._file:
+            self._writer.writerow(row)
+            return
+        self._pending.append(row)
+        if len(self._pending) >= self.batch_rows:
+            self._flush()
+
+    def _flush(self):
+        if self._pending:
+            self._writer.write_batch(pa.RecordBatch.from_pylist(self._pending, schema=self._schema))
+            self._pending = []
+
+    def close(self):
+        if self._file:
+            self._file.close()
+        else:
+            self._flush()
+            self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
 
-# --------------- Storage helpers ---------------
 def save_to_csv(df, filepath):
-    df.to_csv(filepath, index=False, encoding="utf-8")
+    if PYARROW_AVAILABLE:
+        # Arrow formats and quotes whole columns in C++
+        pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), filepath)
+    else:
+        df.to_csv(filepath, index=False, encoding="utf-8")
 def save_to_excel(df, filepath):
-    df.to_excel(filepath, index=False, engine="openpyxl")
+    # written row by row: in constant_memory mode xlsxwriter cannot take pandas' column order
+    wb = xlsxwriter.Workbook(filepath, {"constant_memory": True})
+    ws = wb.add_worksheet()
+    ws.write_row(0, 0, list(df.columns))
+    for r, row in enumerate(df.astype(object).where(df.notna(), None).itertuples(index=False, name=None), start=1):
+        ws.write_row(r, 0, row)
+    wb.close()
+def _sqlite_type(dtype):
+    if dtype.kind in "iub":
+        return "INTEGER"
+    if dtype.kind == "f":
+        return "REAL"
+    return "TEXT"
+
 def save_to_sqlite(df, filepath, table_name="products"):
-    conn = sqlite3.connect(filepath)
-    df.to_sql(table_name, conn, if_exists="replace", index=False)
+    conn = sqlite3.connect(filepath, isolation_level=None)
+    # WAL + NORMAL sync: no fsync per statement group; temp tables/indices stay in memory
+    conn.executescript("PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL; "
+                       "PRAGMA temp_store=MEMORY; PRAGMA cache_size=-200000;")
+    cols = df.columns
+    col_defs = ", ".join([f"`{c}` {_sqlite_type(df[c].dtype)}" for c in cols])
+    insert_sql = f"INSERT INTO `{table_name}` ({', '.join([f'`{c}`' for c in cols])}) VALUES ({', '.join(['?']*len(cols))})"
+    # whole load in one explicit transaction; one prepared statement fed straight from the frame
+    conn.execute("BEGIN")
+    conn.execute(f"DROP TABLE IF EXISTS `{table_name}`")
+    conn.execute(f"CREATE TABLE `{table_name}` ({col_defs})")
+    conn.executemany(insert_sql, df.astype(object).where(df.notna(), None).itertuples(index=False, name=None))
+    conn.commit()
     conn.close()
 
+# Rows per INSERT statement when saving to MySQL
+MYSQL_BATCH_ROWS = 10000
+
+# Column types for the scraped fields; anything else is stored as TEXT
+_MYSQL_TYPES = {"Title": "VARCHAR(512)", "Price": "VARCHAR(16)", "Rating": "SMALLINT",
+                "Page": "SMALLINT", "Link": "VARCHAR(512)"}
+
 def save_to_mysql(df, host, port, user, password, database, table_name="products"):
     if not MYSQL_AVAILABLE:
         raise RuntimeError("mysql-connector-python not installed.")
-    conn = mysql.connector.connect(host=host, port=port, user=user, password=password)
+    # use_pure=False -> C extension does the parameter encoding
+    conn = mysql.connector.connect(host=host, port=port, user=user, password=password, use_pure=False)
     cursor = conn.cursor()
     # create database if not exists
     cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{database}`")
@@ -150,19 +384,31 @@ def save_to_mysql(df, host, port, user, password, database, table_name="products
     cols = df.columns
     # drop table if exists and create fresh
     cursor.execute(f"DROP TABLE IF EXISTS `{table_name}`")
-    # construct create statement with TEXT columns for simplicity
-    col_defs = ", ".join([f"`{c}` TEXT" for c in cols])
+    # construct create statement with typed columns for the known fields, TEXT for the rest
+    col_defs = ", ".join([f"`{c}` {_MYSQL_TYPES.get(c, 'TEXT')}" for c in cols])
     create_sql = f"CREATE TABLE `{table_name}` ({col_defs})"
     cursor.execute(create_sql)
+    # one transaction for the whole load, without per-row index/FK checks
+    conn.autocommit = False
+    cursor.execute("SET unique_checks=0")
+    cursor.execute("SET foreign_key_checks=0")
     # insert rows
     insert_sql = f"INSERT INTO `{table_name}` ({', '.join([f'`{c}`' for c in cols])}) VALUES ({', '.join(['%s']*len(cols))})"
-    rows = [tuple(str(x) for x in r) for r in df.values.tolist()]
-    cursor.executemany(insert_sql, rows)
+    # the driver binds the native values; NaN has no MySQL equivalent, so send NULL
+    rows = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+    # executemany sends each batch as one multi-VALUES INSERT; batching keeps it under max_allowed_packet
+    while True:
+        batch = list(islice(rows, MYSQL_BATCH_ROWS))
+        if not batch:
+            break
+        cursor.executemany(insert_sql, batch)
     conn.commit()
     cursor.close()
     conn.close()
 
 # --------------- GUI ---------------
+PREVIEW_LIMIT = 200  # preview size; every row is in self.spool_path
+
 class ScraperGUI:
     def __init__(self, root):
         self.root = root
@@ -171,7 +417,10 @@ class ScraperGUI:
         root.resizable(False, False)
 
         self.stop_event = False
-        self.results = []
+        # Scraped rows are written to a temporary CSV as they arrive; only the preview is kept in memory
+        self.spool_path = None
+        self.row_count = 0
+        self.preview = []
 
         # Frame: Input
         frame_top = ttk.LabelFrame(root, text="Scrape Settings")
@@ -240,6 +489,10 @@ class ScraperGUI:
         # Internal
         self.output_folder = os.path.abspath(".")
         self.scrape_thread = None
+        # Latest page reported by the worker; the UI reads it on a timer instead of per-page callbacks
+        self._latest_page = 0
+        self._total_pages = None
+        self._tick_job = None
 
     def on_save_type_change(self, *args):
         if self.save_type.get() == "mysql":
@@ -265,10 +518,13 @@ class ScraperGUI:
 
         # reset state
         self.stop_event = False
-        self.results = []
+        self._reset_spool()
         self.tree.delete(*self.tree.get_children())
-        self.progress["value"] = 0
+        self.progress.config(value=0, maximum=100)
         self.status_text.set("Starting...")
+        self._latest_page = 0
+        self._total_pages = None
+        self._tick_job = self.root.after(100, self._tick)
 
         # run in thread
         self.scrape_thread = threading.Thread(target=self._run_scrape,
@@ -276,53 +532,97 @@ class ScraperGUI:
                                               daemon=True)
         self.scrape_thread.start()
 
+    def _reset_spool(self):
+        if self.spool_path and os.path.exists(self.spool_path):
+            os.remove(self.spool_path)
+        fd, self.spool_path = tempfile.mkstemp(prefix="scrape_", suffix=".csv")
+        os.close(fd)
+        self.row_count = 0
+        self.preview = []
+
     def _run_scrape(self, start_url, max_pages):
         try:
-            def progress_cb(current_page, _):
-                # This callback runs in worker thread — use after() to update UI
-                self.root.after(0, lambda: self.status_text.set(f"Scraped pages: {current_page}"))
-                # increase progress in small increments
-                self.root.after(0, lambda: self.progress.step(10))
+            def progress_cb(current_page, total_pages):
+                # This callback runs in worker thread — _tick picks the values up on the UI thread
+                self._total_pages = total_pages
+                self._latest_page = current_page
 
             self.root.after(0, lambda: self.status_text.set("Scraping in progress..."))
-            data = scrape_books_toscrape(start_url, max_pages=max_pages,
-                                         progress_callback=progress_cb,
-                                         stop_flag=lambda: self.stop_event)
-            self.results = data
+            with SpoolWriter(self.spool_path) as writer:
+                for row in scrape_books_toscrape(start_url, max_pages=max_pages,
+                                                 progress_callback=progress_cb,
+                                                 stop_flag=lambda: self.stop_event):
+                    writer.write(row)
+                    self.row_count += 1
+                    if self.row_count <= PREVIEW_LIMIT:
+                        # Treeview values are built here, off the UI thread
+                        self.preview.append((row["Title"][:60], row["Price"], row["Rating"],
+                                             row["Availability"][:30], row["Page"]))
+            count = self.row_count
+            self.root.after(0, self._stop_tick)
             # populate treeview (in main thread)
             self.root.after(0, self._populate_preview)
-            self.root.after(0, lambda: self.status_text.set(f"Scraping finished. {len(data)} items found."))
-            self.root.after(0, lambda: self.progress.config(value=100))
+            self.root.after(0, lambda: self.status_text.set(f"Scraping finished. {count} items found."))
+            self.root.after(0, lambda: self.progress.config(value=self.progress["maximum"]))
         except Exception as e:
-            self.root.after(0, lambda: messagebox.showerror("Error", f"Scraping failed: {e}"))
+            msg = str(e)
+            self.root.after(0, self._stop_tick)
+            # rows scraped before the failure are still in the spool and can be saved
+            self.root.after(0, self._populate_preview)
+            self.root.after(0, lambda: messagebox.showerror("Error", f"Scraping failed: {msg}"))
             self.root.after(0, lambda: self.status_text.set("Error during scraping"))
 
+    def _tick(self):
+        # One UI update every 100 ms, however fast pages complete
+        page, total = self._latest_page, self._total_pages
+        if page and total:
+            self.status_text.set(f"Scraped pages: {page} of {total}")
+            self.progress["maximum"] = total
+            self.progress["value"] = page
+        elif page:
+            self.status_text.set(f"Scraped pages: {page}")
+            # page count unknown: increase progress in small increments
+            self.progress["maximum"] = 100
+            self.progress["value"] = min(100, page * 10)
+        self._tick_job = self.root.after(100, self._tick)
+
+    def _stop_tick(self):
+        if self._tick_job:
+            self.root.after_cancel(self._tick_job)
+            self._tick_job = None
+
     def _populate_preview(self):
         self.tree.delete(*self.tree.get_children())
-        for item in self.results[:200]:  # show first 200 items for preview
-            self.tree.insert("", "end", values=(item["Title"][:60], item["Price"], item["Rating"], item["Availability"][:30], item["Page"]))
+        # All rows go in from this one callback, so Tk lays out and redraws once when it goes idle
+        insert = self.tree.insert
+        for values in self.preview:  # show first PREVIEW_LIMIT items for preview
+            insert("", "end", values=values)
 
     def save_results(self):
-        if not self.results:
+        # the spool is incomplete (and partly buffered in SpoolWriter) until the scrape thread ends
+        if self.scrape_thread and self.scrape_thread.is_alive():
+            messagebox.showinfo("Already running", "Wait for the scraping job to finish before saving.")
+            return
+        if not self.row_count:
             messagebox.showinfo("No data", "No results to save. Run a scrape first.")
             return
-        df = pd.DataFrame(self.results)
         stype = self.save_type.get()
         try:
             if stype == "csv":
                 filepath = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files","*.csv")])
                 if not filepath: return
-                save_to_csv(df, filepath)
+                # rows were spooled as CSV, so exporting is a file copy
+                shutil.copyfile(self.spool_path, filepath)
                 messagebox.showinfo("Saved", f"Saved CSV to:\n{filepath}")
             elif stype == "excel":
                 filepath = filedialog.asksaveasfilename(defaultextension=".xlsx", filetypes=[("Excel files","*.xlsx")])
                 if not filepath: return
-                save_to_excel(df, filepath)
+                save_to_excel(read_spool(self.spool_path), filepath)
                 messagebox.showinfo("Saved", f"Saved Excel to:\n{filepath}")
             elif stype == "sqlite":
                 filepath = filedialog.asksaveasfilename(defaultextension=".db", filetypes=[("SQLite DB","*.db")])
                 if not filepath: return
-                save_to_sqlite(df, filepath)
+                save_to_sqlite(read_spool(self.spool_path), filepath)
                 messagebox.showinfo("Saved", f"Saved SQLite DB to:\n{filepath}")
             elif stype == "mysql":
                 if not MYSQL_AVAILABLE:
@@ -335,7 +635,7 @@ class ScraperGUI:
                 password = self.mysql_pass.get()
                 database = self.mysql_db.get().strip() or "scraper_db"
                 # perform save
-                save_to_mysql(df, host, port, user, password, database)
+                save_to_mysql(read_spool(self.spool_path), host, port, user, password, database)
                 messagebox.showinfo("Saved", f"Saved to MySQL database `{database}` on {host}:{port}")
             else:
                 messagebox.showerror("Unknown", "Unknown save type.")
@@ -354,10 +654,17 @@ class ScraperGUI:
             messagebox.showinfo("Open folder", f"Folder: {os.path.abspath('.')}")
 
     def clear_results(self):
-        self.results = []
+        if self.scrape_thread and self.scrape_thread.is_alive():
+            messagebox.showinfo("Already running", "Stop the scraping job before clearing results.")
+            return
+        if self.spool_path and os.path.exists(self.spool_path):
+            os.remove(self.spool_path)
+        self.spool_path = None
+        self.row_count = 0
+        self.preview = []
         self.tree.delete(*self.tree.get_children())
         self.status_text.set("Cleared results")
-        self.progress["value"] = 0
+        self.progress.config(value=0, maximum=100)
 
 # --------------- Run ---------------
 if __name__ == "__main__":